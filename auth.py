@@ -0,0 +1,80 @@
+"""
+API Key Auth (RBAC)
+
+FastAPI dependencies that resolve the X-API-Key header to an AuthContext
+and enforce roles. Shared by every router that needs authentication.
+"""
+
+import hashlib
+from cachetools import TTLCache
+from fastapi import HTTPException, Header, Depends
+from typing import Callable, Dict, Optional
+
+from database import db
+from models_api import AuthContext
+
+# Resolved auth contexts keyed by the API key hash (never the raw key).
+# The cache is per worker process: a rotated key, or a deleted or demoted user,
+# can keep its cached access for up to the 60s TTL in every other worker.
+_auth_cache = TTLCache(maxsize=10_000, ttl=60)
+
+
+def hash_api_key(api_key: str) -> bytes:
+    """BLAKE2b-128 digest stored as useraccount.api_key_hash; the plaintext key is never stored"""
+    return hashlib.blake2b(api_key.encode(), digest_size=16).digest()
+
+
+async def get_auth_context(x_api_key: Optional[str] = Header(default=None)) -> AuthContext:
+    """
+    Minimal API key auth using "useraccount" collection.
+    - Clients send X-API-Key header.
+    - We lookup a useraccount by the key's hash and return role + company context.
+    - Successful lookups are cached for a short TTL to skip the DB round-trip.
+    """
+    if not x_api_key:
+        raise HTTPException(status_code=401, detail="Missing X-API-Key header")
+
+    key_hash = hash_api_key(x_api_key)
+    ctx = _auth_cache.get(key_hash)
+    if ctx is not None:
+        return ctx
+
+    doc = await db["useraccount"].find_one(
+        {"api_key_hash": key_hash},
+        {"email": 1, "role": 1, "company_id": 1},
+    ) if db is not None else None
+    if not doc:
+        raise HTTPException(status_code=401, detail="Invalid API key")
+
+    ctx = AuthContext(
+        user_id=str(doc.get("_id")),
+        email=doc.get("email"),
+        role=doc.get("role", "viewer"),
+        company_id=doc.get("company_id")
+    )
+    _auth_cache[key_hash] = ctx
+    return ctx
+
+
+# One dependency per role set, so routes sharing a role set share the same callable
+_ROLE_DEPS: Dict[frozenset, Callable] = {}
+
+
+def require_roles(*roles: str):
+    key = frozenset(roles)
+    dependency = _ROLE_DEPS.get(key)
+    if dependency is not None:
+        return dependency
+
+    async def dependency(ctx: AuthContext = Depends(get_auth_context)) -> AuthContext:
+        if ctx.role not in key:
+            raise HTTPException(status_code=403, detail="Forbidden: insufficient role")
+        return ctx
+
+    _ROLE_DEPS[key] = dependency
+    return dependency
+
+
+def evict_api_key(key_hash: bytes):
+    """Drop a cached auth context in this worker; other workers accept the old key for up to the TTL"""
+    _auth_cache.pop(bytes(key_hash), None)
@@ -0,0 +1,56 @@
+"""
+One-off Migration: plaintext API keys -> api_key_hash
+
+useraccount.api_key used to hold the plaintext key. Run this once before
+deploying the hashed-key version, with the same DATABASE_URL/DATABASE_NAME:
+
+    python migrate_api_keys.py
+
+It drops the old unique api_key index (which would reject every new user
+once the field is gone), replaces each string api_key with its hash and
+unsets it. Safe to re-run; non-string keys are skipped and reported.
+"""
+
+import asyncio
+from pymongo import UpdateOne
+from pymongo.errors import OperationFailure
+
+from auth import hash_api_key
+from database import db
+
+BATCH_SIZE = 1000
+INDEX_NOT_FOUND = 27
+
+
+async def migrate():
+    if db is None:
+        raise Exception("Database not available. Check DATABASE_URL and DATABASE_NAME environment variables.")
+    users = db["useraccount"]
+
+    if "api_key_1" in await users.index_information():
+        try:
+            await users.drop_index("api_key_1")
+        except OperationFailure as e:
+            # Another run dropped it first
+            if e.code != INDEX_NOT_FOUND:
+                raise
+
+    migrated = 0
+    ops = []
+    async for doc in users.find({"api_key": {"$type": "string"}}, {"api_key": 1}):
+        ops.append(UpdateOne(
+            {"_id": doc["_id"]},
+            {"$set": {"api_key_hash": hash_api_key(doc["api_key"])}, "$unset": {"api_key": ""}},
+        ))
+        if len(ops) >= BATCH_SIZE:
+            migrated += (await users.bulk_write(ops, ordered=False)).modified_count
+            ops = []
+    if ops:
+        migrated += (await users.bulk_write(ops, ordered=False)).modified_count
+
+    skipped = await users.count_documents({"api_key": {"$exists": True}})
+    print(f"Hashed {migrated} API keys; {skipped} non-string api_key values left untouched")
+
+
+if __name__ == "__main__":
+    asyncio.run(migrate())
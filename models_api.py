@@ -0,0 +1,42 @@
+"""
+API Request Models
+
+Pydantic models for request payloads and the resolved auth context.
+These are API-facing only and are not stored as collections; see
+schemas.py for the MongoDB collection schemas.
+"""
+
+from pydantic import BaseModel, Field
+from typing import List, Literal, Optional
+
+# -------- Auth --------
+
+class AuthContext(BaseModel):
+    user_id: str
+    email: str
+    role: str
+    company_id: Optional[str] = None
+
+# -------- Mini-ERP requests --------
+
+class CompanyCreate(BaseModel):
+    name: str
+    industry: Optional[str] = None
+    country: Optional[str] = None
+    modules: List[str] = Field(default_factory=list)
+
+class ModuleToggle(BaseModel):
+    company_id: str
+    name: str
+    enabled: bool
+
+# -------- User management requests --------
+
+class UserCreate(BaseModel):
+    name: str
+    email: str
+    role: Literal['admin', 'manager', 'viewer'] = "viewer"
+    company_id: Optional[str] = None
+
+class APIKeyIssue(BaseModel):
+    email: str
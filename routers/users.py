@@ -0,0 +1,68 @@
+"""
+User Routes
+
+User management for RBAC bootstrap: account creation and API key rotation.
+"""
+
+import logging
+import secrets
+from fastapi import APIRouter, HTTPException, Depends
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError, PyMongoError
+
+from auth import evict_api_key, hash_api_key, require_roles
+from database import db, create_document
+from models_api import AuthContext, UserCreate, APIKeyIssue
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+@router.on_event("startup")
+async def ensure_indexes():
+    """Create the indexes backing the auth and user lookups"""
+    if db is None:
+        return
+    users = db["useraccount"]
+    try:
+        # The plaintext-key migration is a one-off script, not run per worker here
+        if "api_key_1" in await users.index_information():
+            logger.warning("Legacy useraccount api_key index found; run migrate_api_keys.py")
+        await users.create_index("api_key_hash", unique=True, sparse=True)
+    except PyMongoError:
+        logger.exception("Could not create useraccount api_key_hash index")
+    # Emails were not unique before this index existed, so duplicates may block it;
+    # keep serving (lookups just scan) rather than fail startup
+    try:
+        await users.create_index("email", unique=True)
+    except PyMongoError:
+        logger.exception("Could not create unique useraccount email index; check for duplicate emails")
+
+@router.post("/api/users")
+async def create_user(payload: UserCreate, ctx: AuthContext = Depends(require_roles("admin"))):
+    # Only the hash is stored; the plaintext key is returned to the creator once
+    api_key = secrets.token_hex(16)
+    # UserCreate already validated the fields, so insert the dict without a second UserAccount pass
+    try:
+        user_id = await create_document("useraccount", {**payload.__dict__, "api_key_hash": hash_api_key(api_key)})
+    except DuplicateKeyError:
+        raise HTTPException(status_code=409, detail="A user with this email already exists")
+    return {"id": user_id, "api_key": api_key}
+
+@router.post("/api/users/issue-key")
+async def issue_api_key(payload: APIKeyIssue, ctx: AuthContext = Depends(require_roles("admin"))):
+    new_key = secrets.token_hex(16)
+    # Single round-trip; the pre-update document carries the old hash to evict from the cache
+    doc = await db["useraccount"].find_one_and_update(
+        {"email": payload.email},
+        {"$set": {"api_key_hash": hash_api_key(new_key)}},
+        projection={"api_key_hash": 1},
+        return_document=ReturnDocument.BEFORE,
+    ) if db is not None else None
+    if not doc:
+        raise HTTPException(status_code=404, detail="User not found")
+    # Evict the old key's cached context here; other worker processes keep
+    # accepting it for up to the auth cache TTL (60s)
+    if doc.get("api_key_hash"):
+        evict_api_key(doc["api_key_hash"])
+    return {"api_key": new_key}
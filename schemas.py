@@ -70,7 +70,7 @@ class UserAccount(BaseModel):
     email: str = Field(..., description="Unique email")
     company_id: Optional[str] = Field(None, description="Company association (string _id)")
     role: Literal['admin', 'manager', 'viewer'] = Field('viewer', description="Role for access control")
-    api_key: str = Field(..., description="API key used for simple auth (store securely in production)")
+    api_key_hash: bytes = Field(..., description="BLAKE2b-128 digest of the API key used for simple auth; the plaintext key is never stored")
 
 # Note: The Flames database viewer will automatically:
 # 1. Read these schemas from GET /schema endpoint
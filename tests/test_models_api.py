@@ -0,0 +1,35 @@
+"""
+The write endpoints read request models via __dict__ instead of model_dump().
+These must stay equal; an alias, nested model or extra="allow" would break that.
+"""
+
+from models_api import CompanyCreate, ModuleToggle, UserCreate
+
+
+def assert_dict_matches_dump(model):
+    assert dict(model.__dict__) == model.model_dump()
+
+
+def test_company_create_dict_matches_dump():
+    assert_dict_matches_dump(CompanyCreate(name="Acme", industry="Retail", country="DE", modules=["Sales", "HR"]))
+
+
+def test_company_create_defaults_dict_matches_dump():
+    payload = CompanyCreate(name="Acme")
+    assert payload.__dict__["modules"] == []
+    assert_dict_matches_dump(payload)
+
+
+def test_module_toggle_dict_matches_dump():
+    assert_dict_matches_dump(ModuleToggle(company_id="c1", name="Sales", enabled=False))
+
+
+def test_user_create_dict_matches_dump():
+    assert_dict_matches_dump(UserCreate(name="Ann", email="ann@example.com", role="manager", company_id="c1"))
+
+
+def test_user_create_defaults_dict_matches_dump():
+    payload = UserCreate(name="Ann", email="ann@example.com")
+    assert payload.__dict__["role"] == "viewer"
+    assert payload.__dict__["company_id"] is None
+    assert_dict_matches_dump(payload)